@@ -1,38 +1,175 @@
 #Version 1.0
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import numpy as np
 import pandas as pd
+import polars as pl
 import networkx as nx
-import matplotlib.pyplot as plt
-from collections import defaultdict
+
+# Run NetworkX graph construction and algorithms on the GPU when nx-cugraph is installed.
+# from_pandas_edgelist is a generator, so it needs the 'generators' priority as well.
+try:
+    import nx_cugraph  # noqa: F401
+    nx.config.backend_priority = {'algos': ['cugraph'], 'generators': ['cugraph']}
+    nx.config.cache_converted_graphs = True
+except (ImportError, ValueError):
+    pass
+
+# SciPy and Numba are optional; without either, co-occurrences are counted with Polars
+try:
+    import scipy.sparse
+    HAVE_SCIPY = True
+except ImportError:
+    HAVE_SCIPY = False
+
+# Numba is only imported when SciPy is missing, since the sparse path is preferred
+HAVE_NUMBA = False
+prange = range
+if not HAVE_SCIPY:
+    try:
+        from numba import njit, prange
+        HAVE_NUMBA = True
+    except ImportError:
+        pass
+
+logger = logging.getLogger(__name__)
+
+# Column types forced when reading the skill data; columns missing from the file are ignored
+KEY_COLUMN_SCHEMA = {'Element ID': pl.String, 'Element Name': pl.String, 'Region': pl.String}
 
 # -------------------------------
 # Data Parsing and Processing
 # -------------------------------
 def parse_skill_data(file_path):
     """
-    Parse and process skill data from the provided Excel file.
+    Parse and process skill data from the provided CSV file.
     
-    Expected Excel columns: 
+    Expected CSV columns: 
       - 'Element ID' : The job type identifier.
       - 'Element Name' : Unique identifier for a skill (e.g., '2.A.1.a').
       - 'Region'  : (Optional) Region information associated with the job.
       
+    The file is read with Polars and handed back as a pyarrow-backed pandas
+    DataFrame for the downstream functions. 'Element ID', 'Element Name' and
+    'Region' are cast to categoricals so grouping works on integer codes.
+      
     Returns:
         A pandas DataFrame containing the skill data.
     """
     try:
-        df = pd.read_csv(file_path)
-        print(df)
+        # Read the key columns as strings; Polars otherwise infers their type from
+        # the first 100 rows only and fails on a later non-numeric ID
+        df = pl.read_csv(file_path, schema_overrides=KEY_COLUMN_SCHEMA).to_pandas(
+            use_pyarrow_extension_array=True)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", df.head())
         # Validate required columns
-        print("Columns in the file:", df.columns)
+        logger.debug("Columns in the file: %s", list(df.columns))
         required_columns = ['Element ID', 'Element Name']
         for col in required_columns:
             if col not in df.columns:
                 raise ValueError(f"Missing required column: {col}")
+            df[col] = df[col].astype('category')
+        if 'Region' in df.columns:
+            df['Region'] = df['Region'].astype('category')
         return df
     except Exception as e:
         print(f"Error parsing skill data: {e}")
         return None
 
+# -------------------------------
+# Skill Co-occurrence Counting
+# -------------------------------
+def _job_skill_pair_keys(offsets, skills):
+    """
+    Enumerate every skill pair within each job type.
+    
+    skills holds int skill codes sorted by job, and the skills of job j are
+    skills[offsets[j]:offsets[j+1]]. Each pair is packed into one uint64 as
+    (smaller code << 32) | larger code.
+    
+    Returns:
+        A uint64 array with one key per (job, skill pair).
+    """
+    n_jobs = len(offsets) - 1
+    pair_offsets = np.zeros(n_jobs + 1, dtype=np.int64)
+    for j in range(n_jobs):
+        n_skills = offsets[j + 1] - offsets[j]
+        pair_offsets[j + 1] = pair_offsets[j] + n_skills * (n_skills - 1) // 2
+    
+    keys = np.empty(pair_offsets[n_jobs], dtype=np.uint64)
+    for j in prange(n_jobs):
+        k = pair_offsets[j]
+        for a in range(offsets[j], offsets[j + 1]):
+            for b in range(a + 1, offsets[j + 1]):
+                lo = min(skills[a], skills[b])
+                hi = max(skills[a], skills[b])
+                keys[k] = (np.uint64(lo) << np.uint64(32)) | np.uint64(hi)
+                k += 1
+    return keys
+
+if HAVE_NUMBA:
+    _job_skill_pair_keys = njit(parallel=True, cache=True)(_job_skill_pair_keys)
+
+def count_skill_co_occurrences(df):
+    """
+    Count, for every pair of skills, the number of job types they share.
+    
+    With SciPy installed this is the upper triangle of A.T @ A, where A is the
+    binary (job type x skill) incidence matrix. Otherwise the Numba kernel
+    above is used when Numba is installed, and a Polars self-join on
+    'Element ID' as a last resort.
+    
+    Returns:
+        A pandas DataFrame with columns 'src', 'dst' and 'weight'.
+    """
+    if not (HAVE_SCIPY or HAVE_NUMBA):
+        pairs = pl.from_pandas(df[['Element ID', 'Element Name']]).unique()
+        co_occurrence = (
+            pairs.join(pairs, on='Element ID')
+            .filter(pl.col('Element Name') < pl.col('Element Name_right'))
+            .group_by(['Element Name', 'Element Name_right'])
+            .len()
+        )
+        return co_occurrence.rename(
+            {'Element Name': 'src', 'Element Name_right': 'dst', 'len': 'weight'}
+        ).to_pandas()
+    
+    # Factorize job types and skills to int codes; rows missing either key are
+    # dropped, as pd.factorize would code them -1
+    pairs = df[['Element ID', 'Element Name']].dropna().drop_duplicates()
+    jobs, job_names = pd.factorize(pairs['Element ID'])
+    skills, skill_names = pd.factorize(pairs['Element Name'])
+    
+    if HAVE_SCIPY:
+        incidence = scipy.sparse.csr_matrix(
+            (np.ones(len(jobs), dtype=np.int32), (jobs, skills)),
+            shape=(len(job_names), len(skill_names)),
+        )
+        co_occurrence = scipy.sparse.triu(incidence.T @ incidence, k=1).tocoo()
+        return pd.DataFrame({
+            'src': skill_names[co_occurrence.row],
+            'dst': skill_names[co_occurrence.col],
+            'weight': co_occurrence.data,
+        })
+    
+    # Lay the skills out CSR-style by job for the Numba kernel
+    order = np.argsort(jobs, kind='stable')
+    offsets = np.zeros(len(job_names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(jobs, minlength=len(job_names)), out=offsets[1:])
+    
+    keys = _job_skill_pair_keys(offsets, skills[order].astype(np.int32))
+    keys, weights = np.unique(keys, return_counts=True)
+    return pd.DataFrame({
+        'src': skill_names[(keys >> np.uint64(32)).astype(np.int64)],
+        'dst': skill_names[(keys & np.uint64(0xFFFFFFFF)).astype(np.int64)],
+        'weight': weights,
+    })
+
 # -------------------------------
 # Graph Construction
 # -------------------------------
@@ -48,30 +185,214 @@ def create_weighted_skill_graph(df):
     Returns:
         A NetworkX graph representing the skill network.
     """
-    G = nx.Graph()
-    co_occurrence = defaultdict(int)
+    edges_df = count_skill_co_occurrences(df)
     
-    # Group by job type to count co-occurrences
-    grouped = df.groupby('Element ID')
-    for job_type, group in grouped:
-        skills = group['Element Name'].unique()
-        for i in range(len(skills)):
-            for j in range(i+1, len(skills)):
-                pair = tuple(sorted((skills[i], skills[j])))
-                co_occurrence[pair] += 1
+    # Build the graph from the weighted edgelist
+    G = nx.from_pandas_edgelist(edges_df, 'src', 'dst', edge_attr='weight')
     
     # Add nodes with optional region attribute if available
     unique_skills = df['Element Name'].unique()
-    for skill in unique_skills:
-        regions = df[df['Element Name'] == skill]['Region'].unique() if 'Region' in df.columns else None
-        G.add_node(skill, region=regions[0] if regions is not None and len(regions) > 0 else None)
+    skill_region = {}
+    if 'Region' in df.columns:
+        skill_region = df.drop_duplicates('Element Name').set_index('Element Name')['Region'].to_dict()
+    G.add_nodes_from((skill, {'region': skill_region.get(skill)}) for skill in unique_skills)
+    
+    return G
+
+# Built graphs are cached here so unchanged data files are not recomputed
+CACHE_DIR = ".cache"
+
+# Bump whenever the graph construction changes, so stale cached graphs are rebuilt
+CACHE_VERSION = 2
+
+def _write_cache_file(path, write):
+    """
+    Write a cache file atomically: write(tmp_path) fills a temporary file in
+    the same directory, which is then moved over path. An interrupted run
+    never leaves a truncated file behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def _dump_pickle(obj, path):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+def load_or_build_skill_graph(data_file, df):
+    """
+    Return the skill graph for data_file, loading it from CACHE_DIR when the
+    file is unchanged (same path, modification time and size) since it was built.
+    
+    Otherwise the graph is built from df with create_weighted_skill_graph and
+    pickled into the cache, and its edgelist ('src', 'dst', 'weight') is
+    written next to it as a Parquet file for use by other tools. Cache files
+    of older versions of the same data file are removed. The cache is also
+    invalidated by a change of CACHE_VERSION or of the NetworkX version.
     
-    # Add weighted edges based on co-occurrence counts
-    for (skill1, skill2), weight in co_occurrence.items():
-        G.add_edge(skill1, skill2, weight=weight)
+    Only the graph is cached: the caller still parses the CSV into df on a
+    cache hit, since the regional insights need the DataFrame.
     
+    Returns:
+        A NetworkX graph representing the skill network.
+    """
+    stat = os.stat(data_file)
+    path_key = hashlib.md5(os.path.abspath(data_file).encode()).hexdigest()
+    version_key = hashlib.md5(
+        f"{stat.st_mtime}-{stat.st_size}-{CACHE_VERSION}-{nx.__version__}".encode()).hexdigest()
+    cache_name = os.path.join(CACHE_DIR, f"{path_key}-{version_key}")
+    cache_file = cache_name + ".pkl"
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning("Rebuilding unreadable graph cache %s: %s", cache_file, e)
+    
+    G = create_weighted_skill_graph(df)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(path_key + "-") and not name.startswith(f"{path_key}-{version_key}."):
+            os.remove(os.path.join(CACHE_DIR, name))
+    _write_cache_file(cache_file, lambda path: _dump_pickle(G, path))
+    edges_df = nx.to_pandas_edgelist(G, 'src', 'dst')
+    _write_cache_file(cache_name + ".parquet", edges_df.to_parquet)
     return G
 
+# -------------------------------
+# Adjacency Arrays for Neighbor Queries
+# -------------------------------
+def build_skill_adjacency(G):
+    """
+    Materialize the skill graph as CSR-style NumPy arrays for fast neighbor queries.
+    
+    The neighbors of the node with index i are indices[indptr[i]:indptr[i+1]],
+    with their co-occurrence weights at the same positions in weights. Each
+    row lists the neighbors in the same order as G[node].
+    
+    Returns:
+        A dictionary with:
+          - 'nodes'      : Node names, in index order.
+          - 'node_index' : Mapping from node name to index.
+          - 'indptr'     : Row offsets into indices/weights.
+          - 'indices'    : Neighbor node indices.
+          - 'weights'    : Co-occurrence weights.
+    """
+    nodes = list(G.nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    
+    # Row lengths come from the neighbor dict sizes; each undirected edge is
+    # stored in both rows, a self-loop once
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+    np.cumsum(np.fromiter((len(G[node]) for node in nodes), dtype=np.int32, count=len(nodes)),
+              out=indptr[1:])
+    
+    # One pass over the adjacency collects neighbor indices and weights together
+    entries = np.array([(node_index[v], attr['weight'])
+                        for _, nbrs in G.adjacency() for v, attr in nbrs.items()],
+                       dtype=np.int64).reshape(indptr[-1], 2)
+    
+    return {
+        'nodes': nodes,
+        'node_index': node_index,
+        'indptr': indptr,
+        'indices': entries[:, 0].astype(np.int32),
+        'weights': entries[:, 1].astype(np.int32),
+    }
+
+def build_top_neighbors(adjacency, k=10):
+    """
+    Precompute the k heaviest neighbors of every node from the
+    build_skill_adjacency arrays, selecting each row with np.argpartition
+    and sorting only the selected entries. Neighbors with equal weight are
+    ordered by node name, so the result does not depend on the order in
+    which the graph was built.
+    
+    Returns:
+        A list indexed by node index of (neighbor indices, weights) array pairs,
+        ordered by decreasing weight, then by name.
+    """
+    indptr, indices, weights = adjacency['indptr'], adjacency['indices'], adjacency['weights']
+    nodes = adjacency['nodes']
+    # Position of every node when sorted by name, used as the tie-breaker
+    name_rank = np.empty(len(nodes), dtype=np.int64)
+    name_rank[sorted(range(len(nodes)), key=nodes.__getitem__)] = np.arange(len(nodes))
+    
+    top_neighbors = []
+    for i in range(len(nodes)):
+        row_indices = indices[indptr[i]:indptr[i + 1]]
+        row_weights = weights[indptr[i]:indptr[i + 1]]
+        if len(row_weights) > k:
+            # Keep everything above the k-th largest weight, then fill up with the
+            # first neighbors by name tied at that weight
+            threshold = row_weights[np.argpartition(row_weights, -k)[-k]]
+            above = np.flatnonzero(row_weights > threshold)
+            tied = np.flatnonzero(row_weights == threshold)
+            tied = tied[np.argsort(name_rank[row_indices[tied]])][:k - len(above)]
+            top = np.concatenate((above, tied))
+        else:
+            top = np.arange(len(row_weights))
+        top = top[np.lexsort((name_rank[row_indices[top]], -row_weights[top]))]
+        top_neighbors.append((row_indices[top], row_weights[top]))
+    return top_neighbors
+
+class SkillNetwork:
+    """
+    Wrapper around the skill graph that keeps the edge count, CSR adjacency
+    arrays and each node's top 10 neighbors cached, so repeated size and
+    neighbor queries do not traverse the NetworkX adjacency
+    (G.number_of_edges() is O(n)). The arrays and the top 10 table are each
+    built on first use.
+    
+    Downstream code should read the graph through this wrapper and add edges
+    with add_edge so the cached values stay in sync.
+    """
+    def __init__(self, G):
+        self.graph = G
+        self._nedges = G.number_of_edges()
+        self._adjacency = None
+        self._top_neighbors = None
+    
+    def __len__(self):
+        return len(self.graph)
+    
+    def __contains__(self, skill):
+        return skill in self.graph
+    
+    @property
+    def adjacency(self):
+        """The build_skill_adjacency arrays, rebuilt after edges were added."""
+        if self._adjacency is None:
+            self._adjacency = build_skill_adjacency(self.graph)
+        return self._adjacency
+    
+    def number_of_edges(self):
+        return self._nedges
+    
+    def degree(self, skill):
+        # NetworkX answers this in O(1) from the neighbor dict, no arrays needed
+        return self.graph.degree(skill)
+    
+    def top_neighbors(self, skill):
+        """The (neighbor, weight) pairs of the 10 heaviest edges of skill, heaviest first, ties by name."""
+        adjacency = self.adjacency
+        if self._top_neighbors is None:
+            self._top_neighbors = build_top_neighbors(adjacency)
+        neighbor_indices, weights = self._top_neighbors[adjacency['node_index'][skill]]
+        return [(adjacency['nodes'][j], int(w)) for j, w in zip(neighbor_indices, weights)]
+    
+    def add_edge(self, skill1, skill2, weight):
+        if not self.graph.has_edge(skill1, skill2):
+            self._nedges += 1
+        self.graph.add_edge(skill1, skill2, weight=weight)
+        self._adjacency = None
+        self._top_neighbors = None
+
 # -------------------------------
 # Contextual Regional Insights
 # -------------------------------
@@ -86,8 +407,8 @@ def get_regional_insights(df):
     """
     insights = {}
     if 'Region' in df.columns:
-        # Count unique job types per region
-        region_counts = df.groupby('Region')['JobType'].nunique().to_dict()
+        # Count unique job types ('Element ID') per region
+        region_counts = df.groupby('Region', sort=False, observed=True)['Element ID'].nunique().to_dict()
         insights['job_types_by_region'] = region_counts
     else:
         insights['job_types_by_region'] = "No regional data available."
@@ -96,50 +417,98 @@ def get_regional_insights(df):
 # -------------------------------
 # Interactive Visualization
 # -------------------------------
-def visualize_skill_graph(G):
+# Node labels are not drawn above this many nodes, they would be unreadable anyway
+MAX_LABELED_NODES = 500
+
+# Node positions of previously drawn graphs, keyed by a digest of the graph
+_layout_cache = {}
+
+def _graph_digest(G):
+    """
+    Hash the nodes and weighted edges of G into a short hex digest, so a
+    layout can be cached without keeping a copy of the graph.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(G.nodes)).encode())
+    for u, v, w in G.edges(data='weight'):
+        digest.update(repr((u, v, w)).encode())
+    return digest.hexdigest()
+
+def compute_layout(G):
+    """
+    Compute node positions for the skill graph with spring_layout, reusing the
+    cached layout if the same graph was laid out before. spring_layout already
+    switches to its sparse solver for graphs above 500 nodes.
+    
+    Returns:
+        A dictionary mapping each node to its position.
+    """
+    key = _graph_digest(G)
+    if key not in _layout_cache:
+        _layout_cache[key] = nx.spring_layout(G)
+    return _layout_cache[key]
+
+def visualize_skill_graph(network, output_file="output/skill_graph.png"):
     """
     Visualize the weighted skill network graph using matplotlib.
     Nodes represent skills; edges are drawn with thickness proportional to their weight.
+    
+    If the SKILLNET_HEADLESS environment variable is set, the figure is rendered
+    with the non-interactive Agg backend and saved to output_file instead of shown.
     """
-    pos = nx.spring_layout(G)  # Determine node positions using a force-directed layout
+    # Imported here so runs that never draw skip matplotlib's startup cost
+    import matplotlib
+    headless = bool(os.environ.get('SKILLNET_HEADLESS'))
+    if headless:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    G = network.graph
+    pos = compute_layout(G)  # Determine node positions using a force-directed layout
     
     # Draw nodes
     nx.draw_networkx_nodes(G, pos, node_size=500, node_color='lightblue')
     
     # Draw edges with widths proportional to co-occurrence weight
-    edges = G.edges(data=True)
-    weights = [data['weight'] for (_, _, data) in edges]
-    nx.draw_networkx_edges(G, pos, width=[w * 0.5 for w in weights], edge_color='gray')
+    weights = np.fromiter((w for _, _, w in G.edges(data='weight')), dtype=np.float32,
+                          count=network.number_of_edges())
+    nx.draw_networkx_edges(G, pos, width=weights * 0.5, edge_color='gray')
     
     # Draw node labels
-    nx.draw_networkx_labels(G, pos, font_size=8, font_family='sans-serif')
+    if len(G) <= MAX_LABELED_NODES:
+        nx.draw_networkx_labels(G, pos, font_size=8, font_family='sans-serif')
     
     plt.title("Weighted Skill Network Graph")
     plt.axis('off')
+    if headless:
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        plt.savefig(output_file)
+        plt.close()
+        return
     plt.show()
 
 # -------------------------------
 # User Interface (Command-Line)
 # -------------------------------
-def user_interface(G):
+def user_interface(network):
     """
     A simple command-line interface for users to input a Skill ID and retrieve:
       - The top 10 most related skills based on co-occurrence.
       - A placeholder for job types where these skills co-occur.
+    
+    network is the SkillNetwork wrapping the skill graph.
     """
     skill_id = input("Enter a Skill ID (e.g., 2.A.1.a): ").strip()
-    if skill_id not in G.nodes:
+    if skill_id not in network:
         print("Skill ID not found in the network.")
         return
     
-    # Retrieve neighboring skills and sort them by edge weight
-    neighbors = G[skill_id]
-    sorted_neighbors = sorted(neighbors.items(), key=lambda x: x[1]['weight'], reverse=True)
-    top_neighbors = sorted_neighbors[:10]
+    # Top neighbors are precomputed once per network
+    top_neighbors = network.top_neighbors(skill_id)
     
     print(f"\nTop related skills for {skill_id}:")
-    for neighbor, attr in top_neighbors:
-        print(f"- {neighbor} (Co-occurrence weight: {attr['weight']})")
+    for neighbor, weight in top_neighbors:
+        print(f"- {neighbor} (Co-occurrence weight: {weight})")
     
     # Placeholder: Display job types for these skill pairs
     print("\nJob types for these skill pairs: [Feature to be implemented]\n")
@@ -201,24 +570,29 @@ def generate_report(G, insights, output_file):
 # Main Function
 # -------------------------------
 def main():
-    # Parse the skill data from the Excel file
-    data_file = "/Users/injohtanwani/Documents/CS 502/skills-list.xlsx"
-    df = parse_skill_data(data_file)
+    parser = argparse.ArgumentParser(description="Explore the skill co-occurrence network.")
+    parser.add_argument('data_file', nargs='?', default="skills-list.csv",
+                        help="CSV file with 'Element ID', 'Element Name' and optional 'Region' columns")
+    args = parser.parse_args()
+
+    # Parse the skill data from the CSV file
+    df = parse_skill_data(args.data_file)
     if df is None:
         return
 
     # Create the weighted skill network graph with regional segmentation
-    G = create_weighted_skill_graph(df)
+    G = load_or_build_skill_graph(args.data_file, df)
+    network = SkillNetwork(G)
 
     # Get and display contextual regional insights
     insights = get_regional_insights(df)
     print("Regional Insights:", insights)
 
     # Visualize the skill network graph
-    visualize_skill_graph(G)
+    visualize_skill_graph(network)
 
     # Provide a simple user interface for analyzing skill relationships
-    user_interface(G)
+    user_interface(network)
 
     # Run the recommendation engine (stub demonstration)
     recommend_courses("2.A.1.a", G)
@@ -1,13 +1,12 @@
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
 
 
 def add_occupation(skills_graph, node_id, row):
     if (row['Title'], row['Data Value']) not in skills_graph.nodes[node_id]['occupations']:
         skills_graph.nodes[node_id]['occupations'].append((row['Title'], row['Data Value']))
 
-def add_neighbor(skills_graph, group, neighbor_idx, current_node, row):
+def add_neighbor(skills_graph, edge_weights, group, neighbor_idx, current_node, row):
     neighbor_node = group.iloc[neighbor_idx]['Element ID']
     # we dont' want loops to self
     if current_node == neighbor_node:
@@ -18,11 +17,9 @@ def add_neighbor(skills_graph, group, neighbor_idx, current_node, row):
         
     add_occupation(skills_graph, neighbor_node, row)
 
-    if not skills_graph.has_edge(current_node, neighbor_node):
-        skills_graph.add_edge(current_node, neighbor_node)
-        skills_graph[current_node][neighbor_node]["weight"] = 0
-
-    skills_graph[current_node][neighbor_node]["weight"] = skills_graph[current_node][neighbor_node]["weight"] + 1
+    # count the weight here, edges are added in one batch once all occupations are processed
+    edge = (current_node, neighbor_node) if current_node < neighbor_node else (neighbor_node, current_node)
+    edge_weights[edge] = edge_weights.get(edge, 0) + 1
 
 def build_skills_graph(path_to_skills):
     df = pd.read_excel(path_to_skills)
@@ -32,9 +29,11 @@ def build_skills_graph(path_to_skills):
     filtered_df = filtered_df.reset_index()
     
     # group data by O*NET-SOC Code so we can then iterate over each skill in each occupation
-    grouped_df = filtered_df.groupby('O*NET-SOC Code')
+    # the data is already ordered by code, so skip sorting the groups
+    grouped_df = filtered_df.groupby('O*NET-SOC Code', sort=False)
 
     skills_graph = nx.Graph()
+    edge_weights = {}
 
     for code, group in grouped_df:
         # iterate over all groups (one group represents one occupation)
@@ -50,9 +49,11 @@ def build_skills_graph(path_to_skills):
             add_occupation(skills_graph, current_node, row)
 
             for neighbor_idx in range(index+1, group.count()['index']):
-                add_neighbor(skills_graph, group, neighbor_idx, current_node, row)
+                add_neighbor(skills_graph, edge_weights, group, neighbor_idx, current_node, row)
 
             index = index+1
+
+    skills_graph.add_weighted_edges_from((u, v, weight) for (u, v), weight in edge_weights.items())
     return skills_graph
     
 
@@ -0,0 +1,207 @@
+import pytest
+
+import skillNetworkCreation as snc
+
+
+def write_csv(tmp_path, text):
+    path = tmp_path / "skills.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def edge_set(G):
+    return {(frozenset((u, v)), w) for u, v, w in G.edges(data='weight')}
+
+
+@pytest.fixture
+def blank_job_csv(tmp_path):
+    # The last two rows have no 'Element ID' and must not form a job type
+    return write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\nJ2,A\nJ2,C\n,A\n,B\n")
+
+
+@pytest.mark.parametrize('have_scipy, have_numba', [(True, False), (False, True), (False, False)],
+                         ids=['scipy', 'numba', 'polars'])
+def test_blank_element_id_is_ignored(blank_job_csv, monkeypatch, have_scipy, have_numba):
+    monkeypatch.setattr(snc, 'HAVE_SCIPY', have_scipy)
+    monkeypatch.setattr(snc, 'HAVE_NUMBA', have_numba)
+    df = snc.parse_skill_data(blank_job_csv)
+    G = snc.create_weighted_skill_graph(df)
+    assert edge_set(G) == {(frozenset(('A', 'B')), 1), (frozenset(('A', 'C')), 1)}
+
+
+def test_compute_layout_is_cached_by_graph_contents():
+    G = snc.nx.path_graph(4)
+    snc.nx.set_edge_attributes(G, 1, 'weight')
+    pos = snc.compute_layout(G)
+    assert snc.compute_layout(G.copy()) is pos
+    G[0][1]['weight'] = 2
+    assert snc.compute_layout(G) is not pos
+
+
+def test_graph_cache_is_reused(tmp_path, monkeypatch):
+    monkeypatch.setattr(snc, 'CACHE_DIR', str(tmp_path / "cache"))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\n")
+    G = snc.load_or_build_skill_graph(data_file, snc.parse_skill_data(data_file))
+    monkeypatch.setattr(snc, 'create_weighted_skill_graph', lambda df: pytest.fail("graph rebuilt"))
+    assert edge_set(snc.load_or_build_skill_graph(data_file, None)) == edge_set(G)
+
+
+def test_truncated_graph_cache_is_rebuilt(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(snc, 'CACHE_DIR', str(cache_dir))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\n")
+    df = snc.parse_skill_data(data_file)
+    snc.load_or_build_skill_graph(data_file, df)
+    (pickle_file,) = cache_dir.glob("*.pkl")
+    pickle_file.write_bytes(pickle_file.read_bytes()[:10])
+    G = snc.load_or_build_skill_graph(data_file, df)
+    assert edge_set(G) == {(frozenset(('A', 'B')), 1)}
+
+
+def test_graph_cache_replaces_older_versions(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(snc, 'CACHE_DIR', str(cache_dir))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\n")
+    snc.load_or_build_skill_graph(data_file, snc.parse_skill_data(data_file))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\nJ1,C\n")
+    snc.load_or_build_skill_graph(data_file, snc.parse_skill_data(data_file))
+    (pickle_file,) = cache_dir.glob("*.pkl")
+    (parquet_file,) = cache_dir.glob("*.parquet")
+    assert pickle_file.stem == parquet_file.stem
+    assert len(snc.pd.read_parquet(parquet_file)) == 3
+
+
+def baseline_co_occurrence(df):
+    """The original nested-loop co-occurrence count, used as the reference."""
+    co_occurrence = {}
+    for _, group in df.groupby('Element ID'):
+        skills = group['Element Name'].unique()
+        for i in range(len(skills)):
+            for j in range(i + 1, len(skills)):
+                pair = tuple(sorted((skills[i], skills[j])))
+                co_occurrence[pair] = co_occurrence.get(pair, 0) + 1
+    return co_occurrence
+
+
+def random_skill_frame(n_rows, n_jobs, n_skills, seed):
+    rng = snc.np.random.default_rng(seed)
+    return snc.pd.DataFrame({
+        'Element ID': [f"J{j}" for j in rng.integers(0, n_jobs, n_rows)],
+        'Element Name': [f"S{k}" for k in rng.integers(0, n_skills, n_rows)],
+    })
+
+
+def test_top_neighbors_match_baseline_with_name_tie_break():
+    df = random_skill_frame(3000, 300, 60, seed=3)
+    neighbors = {}
+    for (a, b), weight in baseline_co_occurrence(df).items():
+        neighbors.setdefault(a, []).append((b, weight))
+        neighbors.setdefault(b, []).append((a, weight))
+    network = snc.SkillNetwork(snc.create_weighted_skill_graph(df))
+    for skill, pairs in neighbors.items():
+        expected = sorted(pairs, key=lambda x: (-x[1], x[0]))[:10]
+        top = network.top_neighbors(skill)
+        assert top == expected
+        assert all(type(w) is int for _, w in top)
+
+
+def test_parse_keeps_ids_after_numeric_prefix(tmp_path):
+    # More numeric IDs than Polars' default type inference window, then a text ID
+    rows = "".join(f"{i},S{i % 7}\n" for i in range(200))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\n" + rows + "J-x,S1\n")
+    df = snc.parse_skill_data(data_file)
+    assert df is not None
+    assert len(df) == 201
+    assert df['Element ID'].iloc[-1] == 'J-x'
+
+
+def test_graph_cache_is_rebuilt_after_cache_version_change(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(snc, 'CACHE_DIR', str(cache_dir))
+    data_file = write_csv(tmp_path, "Element ID,Element Name\nJ1,A\nJ1,B\n")
+    df = snc.parse_skill_data(data_file)
+    snc.load_or_build_skill_graph(data_file, df)
+    (old_pickle,) = cache_dir.glob("*.pkl")
+    monkeypatch.setattr(snc, 'CACHE_VERSION', snc.CACHE_VERSION + 1)
+    snc.load_or_build_skill_graph(data_file, df)
+    (new_pickle,) = cache_dir.glob("*.pkl")
+    assert new_pickle != old_pickle
+
+
+def test_adjacency_handles_self_loops():
+    G = snc.nx.Graph()
+    G.add_weighted_edges_from([('A', 'B', 2), ('A', 'C', 1)])
+    network = snc.SkillNetwork(G)
+    network.add_edge('A', 'A', 5)
+    assert network.top_neighbors('A') == [('A', 5), ('B', 2), ('C', 1)]
+    assert network.adjacency['indptr'][-1] == 5
+
+
+def test_add_edge_keeps_counts_and_clears_cached_arrays():
+    G = snc.nx.Graph()
+    G.add_weighted_edges_from([('A', 'B', 2), ('B', 'C', 1)])
+    network = snc.SkillNetwork(G)
+    assert network.degree('B') == 2
+    assert network.top_neighbors('A') == [('B', 2)]
+
+    network.add_edge('A', 'C', 3)
+    assert network.number_of_edges() == G.number_of_edges() == 3
+    assert network.degree('A') == 2
+    assert network.top_neighbors('A') == [('C', 3), ('B', 2)]
+
+    # Re-weighting an existing edge does not change the count
+    network.add_edge('A', 'B', 4)
+    assert network.number_of_edges() == 3
+    assert network.top_neighbors('A') == [('B', 4), ('C', 3)]
+
+
+def test_degree_does_not_build_arrays():
+    G = snc.nx.path_graph(3)
+    network = snc.SkillNetwork(G)
+    assert network.degree(1) == 2
+    assert network._adjacency is None
+
+
+def test_compiled_numba_kernel_matches_baseline():
+    numba = pytest.importorskip('numba')
+    kernel = numba.njit(parallel=True)(snc._job_skill_pair_keys)
+    df = random_skill_frame(5000, 400, 120, seed=5)
+
+    pairs = df.drop_duplicates()
+    jobs, job_names = snc.pd.factorize(pairs['Element ID'])
+    skills, skill_names = snc.pd.factorize(pairs['Element Name'])
+    order = snc.np.argsort(jobs, kind='stable')
+    offsets = snc.np.zeros(len(job_names) + 1, dtype=snc.np.int64)
+    snc.np.cumsum(snc.np.bincount(jobs, minlength=len(job_names)), out=offsets[1:])
+
+    keys, weights = snc.np.unique(kernel(offsets, skills[order].astype(snc.np.int32)),
+                                  return_counts=True)
+    counts = {
+        tuple(sorted((skill_names[int(key >> 32)], skill_names[int(key & 0xFFFFFFFF)]))): int(weight)
+        for key, weight in zip(keys, weights)
+    }
+    assert counts == baseline_co_occurrence(df)
+
+
+def test_regional_insights_count_job_types_per_region(tmp_path):
+    data_file = write_csv(tmp_path, "Element ID,Element Name,Region\n"
+                                    "J1,A,North\nJ1,B,North\nJ2,A,North\nJ3,C,South\n")
+    insights = snc.get_regional_insights(snc.parse_skill_data(data_file))
+    assert insights['job_types_by_region'] == {'North': 2, 'South': 1}
+
+
+def test_regional_insights_without_region():
+    df = snc.pd.DataFrame({'Element ID': ['J1'], 'Element Name': ['A']})
+    assert snc.get_regional_insights(df) == {'job_types_by_region': "No regional data available."}
+
+
+def test_headless_visualization_saves_png(tmp_path, monkeypatch):
+    plt = pytest.importorskip('matplotlib.pyplot')
+    monkeypatch.setenv('SKILLNET_HEADLESS', '1')
+    monkeypatch.setattr(plt, 'show', lambda *args, **kwargs: pytest.fail("window shown"))
+    G = snc.nx.Graph()
+    G.add_weighted_edges_from([('A', 'B', 2), ('B', 'C', 1)])
+    output_file = tmp_path / "plots" / "graph.png"
+    snc.visualize_skill_graph(snc.SkillNetwork(G), output_file=str(output_file))
+    assert output_file.read_bytes().startswith(b'\x89PNG')
+    assert plt.get_fignums() == []